@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Nexus A generator benchmark — fixed render matrix, per-stage regression gate
+
+Renders every kind × size × theme for each renderer (plus one pyramid
+chain) through generate.py's in-memory API under its Profiler, repeats
+the run and takes per-stage medians of wall time, pixels, PIL image bytes
+and traced (Python/NumPy) memory. tracemalloc cannot see Pillow's
+buffers, so traced memory is only gated for stages that allocate NumPy
+arrays.
+
+  python bench.py --save     record bench-baseline.json on this machine
+  python bench.py            compare; exit 1 if a stage regressed
+
+Baselines are machine-specific; record one per CI runner type.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+
+import generate as g
+
+KINDS     = ("full", "icon")
+SIZES     = (16, 32, 64, 256, 1024)
+RENDERERS = ("sdf", "ovr")
+PYRAMID   = (1024, [256, 64])   # top render, downsampled levels
+BASELINE  = os.path.join(g.DIR, "bench-baseline.json")
+METRICS   = ("wall", "pixels", "image", "traced")
+PIL_ONLY  = ("resample", "compose", "encode", "ovr/raster")   # traced ~ 0 here
+
+
+def _run_once():
+    """One pass over the matrix -> {"<group>/<stage>": {metric: value}}."""
+    g._geometry.cache_clear()
+    g._masks.cache_clear()
+    g.MASKS.clear()
+    out = {}
+    for renderer in RENDERERS:
+        with g.Profiler() as prof:
+            for kind in KINDS:
+                for sz in SIZES:
+                    for col, bg in g.VARIANTS:
+                        g.render(kind, sz, col, bg, "png", renderer)
+        for stage, a in prof.summary().items():
+            out[f"{renderer}/{stage}"] = {m: a[m] for m in METRICS}
+
+    top, levels = PYRAMID
+    with g.Profiler() as prof:
+        masks = g._masks("icon", top)
+        for sz in levels:
+            masks = g._downsample_masks(sz, masks)
+    for stage, a in prof.summary().items():
+        out[f"pyramid/{stage}"] = {m: a[m] for m in METRICS}
+    return out
+
+
+def measure(repeat=5):
+    runs = [_run_once() for _ in range(repeat)]
+    return {k: {m: statistics.median(r[k][m] for r in runs) for m in METRICS}
+            for k in sorted(runs[0])}
+
+
+def _gated(key, m):
+    return m != "traced" or not (key in PIL_ONLY or key.split("/")[-1] in PIL_ONLY)
+
+
+def compare(base, now, threshold, min_ms):
+    """Rows of (stage, metric, base, now, ratio, failed)."""
+    rows = []
+    for key in sorted(set(base) | set(now)):
+        for m in METRICS:
+            if not _gated(key, m):
+                continue
+            b = base.get(key, {}).get(m)
+            n = now.get(key, {}).get(m)
+            if b is None or n is None:
+                rows.append((key, m, b, n, None, False))
+                continue
+            slack = min_ms / 1e3 if m == "wall" else 0
+            ratio = n / b if b else (1.0 if not n else float("inf"))
+            rows.append((key, m, b, n, ratio, n > b * (1 + threshold) + slack))
+    return rows
+
+
+def _fmt(m, v):
+    if v is None:
+        return "-"
+    if m == "wall":
+        return f"{v*1e3:.2f}ms"
+    if m in ("image", "traced"):
+        return f"{v/2**20:.2f}MB"
+    return f"{v/1e6:.2f}Mpx"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the Nexus A generator.")
+    ap.add_argument("--baseline", default=BASELINE, help="baseline JSON path")
+    ap.add_argument("--save", action="store_true", help="write the baseline and exit")
+    ap.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    ap.add_argument("--threshold", type=float, default=0.25,
+                    help="allowed relative regression per stage (default 0.25)")
+    ap.add_argument("--min-ms", type=float, default=0.5,
+                    help="absolute wall-time slack that absorbs timer noise")
+    ap.add_argument("--json", metavar="PATH", help="also write this run's results")
+    a = ap.parse_args()
+
+    now = measure(a.repeat)
+    if a.json:
+        with open(a.json, "w", encoding="utf-8") as f:
+            json.dump(now, f, indent=2)
+    if a.save:
+        with open(a.baseline, "w", encoding="utf-8") as f:
+            json.dump(now, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"  [OK] {os.path.basename(a.baseline)} ({len(now)} stages)")
+        return 0
+
+    try:
+        with open(a.baseline, encoding="utf-8") as f:
+            base = json.load(f)
+    except OSError:
+        print(f"  [WARN] no baseline at {a.baseline}; run with --save first")
+        return 2
+
+    failed = 0
+    for key, m, b, n, ratio, bad in compare(base, now, a.threshold, a.min_ms):
+        mark = "FAIL" if bad else ("new " if b is None else ("gone" if n is None else "ok  "))
+        r = f"{ratio:6.2f}x" if ratio is not None else "      -"
+        print(f"  [{mark}] {key:<22} {m:<6} {_fmt(m, b):>11} -> {_fmt(m, n):>11} {r}")
+        failed += bad
+    print(f"\n{failed} regression(s) past {a.threshold:.0%}." if failed else "\nNo regressions.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,9 +7,22 @@ Each of the 3 intersection nodes has its own identity color:
   apex   = violet  #8B5CF6
   left   = amber   #F59E0B
   right  = emerald  #10B981
-PNG rendering uses 2-4× oversampling for crack-free smooth strokes.
+PNG rendering computes anti-aliased coverage analytically from signed
+distances (the legacy 2-4× oversampling path remains as --renderer ovr).
 """
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import math
 import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from dataclasses import dataclass
 
 # ── Node identity colors ─────────────────────────────────────────
 NC = ("#8B5CF6", "#F59E0B", "#10B981")   # apex, left, right
@@ -23,18 +36,40 @@ def _bez(t, p0, p1, p2, p3):
         u**3*p0[1] + 3*u**2*t*p1[1] + 3*u*t**2*p2[1] + t**3*p3[1],
     )
 
+def _cubic_roots(a, b, c, d):
+    """Real roots of a·t³ + b·t² + c·t + d = 0, in closed form."""
+    if abs(a) < 1e-12:
+        if abs(b) < 1e-12:
+            return [-d / c] if abs(c) > 1e-12 else []
+        disc = c*c - 4*b*d
+        if disc < 0:
+            return []
+        r = math.sqrt(disc)
+        return [(-c + r) / (2*b), (-c - r) / (2*b)]
+    b, c, d = b/a, c/a, d/a
+    p = c - b*b/3                      # depressed cubic s³ + p·s + q
+    q = 2*b**3/27 - b*c/3 + d
+    off = -b/3
+    disc = (q/2)**2 + (p/3)**3
+    if disc > 0:                       # one real root (Cardano)
+        r = math.sqrt(disc)
+        cbrt = lambda x: math.copysign(abs(x) ** (1/3), x)
+        return [cbrt(-q/2 + r) + cbrt(-q/2 - r) + off]
+    if abs(p) < 1e-12:                 # triple root
+        return [off]
+    m = 2 * math.sqrt(-p/3)            # three real roots (trigonometric)
+    phi = math.acos(max(-1.0, min(1.0, 3*q / (p*m)))) / 3
+    return [m * math.cos(phi - 2*math.pi*k/3) + off for k in range(3)]
+
 def _t_at_y(target, p0, p1, p2, p3):
-    lo, hi = 0.0, 1.0
-    for _ in range(64):
-        mid = (lo + hi) / 2
-        _, y = _bez(mid, p0, p1, p2, p3)
-        if abs(y - target) < 0.05:
-            return mid
-        if y > target:
-            lo = mid
-        else:
-            hi = mid
-    return (lo + hi) / 2
+    ys = (p0[1], p1[1], p2[1], p3[1])
+    a = -ys[0] + 3*ys[1] - 3*ys[2] + ys[3]
+    b = 3*ys[0] - 6*ys[1] + 3*ys[2]
+    c = 3*(ys[1] - ys[0])
+    ts = [t for t in _cubic_roots(a, b, c, ys[0] - target) if -1e-9 <= t <= 1 + 1e-9]
+    if not ts:
+        raise ValueError(f"curve never reaches y={target}")
+    return min(1.0, max(0.0, ts[0]))
 
 def _ctrl(bx, by, apex, bow, side):
     dx, dy = apex[0] - bx, apex[1] - by
@@ -46,15 +81,57 @@ def _ctrl(bx, by, apex, bow, side):
         apex,
     )
 
-def _d(p0, p1, p2, p3):
-    return (f"M {p0[0]:.1f} {p0[1]:.1f} "
-            f"C {p1[0]:.1f} {p1[1]:.1f}, "
-            f"{p2[0]:.1f} {p2[1]:.1f}, "
-            f"{p3[0]:.1f} {p3[1]:.1f}")
+def _f(v, prec=1, minify=False):
+    """Fixed-point SVG number; minified drops trailing zeros."""
+    if prec < 0:
+        raise ValueError(f"precision must be >= 0, got {prec}")
+    s = f"{v:.{prec}f}"
+    if minify and "." in s:
+        s = s.rstrip("0").rstrip(".")
+    return "0" if s == "-0" else s
+
+def _d(p0, p1, p2, p3, prec=1, minify=False):
+    x = [_f(v, prec, minify) for p in (p0, p1, p2, p3) for v in p]
+    if minify:
+        return f"M{x[0]} {x[1]}C{x[2]} {x[3]} {x[4]} {x[5]} {x[6]} {x[7]}"
+    return (f"M {x[0]} {x[1]} "
+            f"C {x[2]} {x[3]}, "
+            f"{x[4]} {x[5]}, "
+            f"{x[6]} {x[7]}")
+
+def _da(x1, y, x2, arc, prec=1, minify=False):
+    x = [_f(v, prec, minify) for v in (x1, y, (x1+x2)/2, y - arc, x2, y)]
+    if minify:
+        return f"M{x[0]} {x[1]}Q{x[2]} {x[3]} {x[4]} {x[5]}"
+    return (f"M {x[0]} {x[1]} "
+            f"Q {x[2]} {x[3]}, {x[4]} {x[5]}")
+
 
-def _da(x1, y, x2, arc):
-    return (f"M {x1:.1f} {y:.1f} "
-            f"Q {(x1+x2)/2:.1f} {y - arc:.1f}, {x2:.1f} {y:.1f}")
+@dataclass(frozen=True)
+class LogoGeometry:
+    """Solved layout of one A: leg curves and crossbar junctions.
+
+    SVG path data for it is formatted (and cached) by _paths().
+    """
+    lc: tuple
+    rc: tuple
+    jl: tuple
+    jr: tuple
+    cb_y: float
+    cb_a: float
+
+    @property
+    def apex(self):
+        return self.lc[3]
+
+@functools.lru_cache(maxsize=None)
+def _geometry(apex, lbx, rbx, by, bow, cb_y, cb_a):
+    with _stage("geometry"):
+        lc = _ctrl(lbx, by, apex, bow, "left")
+        rc = _ctrl(rbx, by, apex, bow, "right")
+        jl = _bez(_t_at_y(cb_y, *lc), *lc)
+        jr = _bez(_t_at_y(cb_y, *rc), *rc)
+        return LogoGeometry(lc, rc, jl, jr, cb_y, cb_a)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -76,25 +153,10 @@ F_AR = 26.0    # apex node radius
 F_NR = 21.0    # junction node radius
 
 def _fg():
-    lc = _ctrl(F_LBX, F_BY, F_APEX, F_BOW, "left")
-    rc = _ctrl(F_RBX, F_BY, F_APEX, F_BOW, "right")
-    return lc, rc, _bez(_t_at_y(F_CB_Y, *lc), *lc), _bez(_t_at_y(F_CB_Y, *rc), *rc)
+    return _geometry(F_APEX, F_LBX, F_RBX, F_BY, F_BOW, F_CB_Y, F_CB_A)
 
-def full_svg(color="currentColor", bg=None):
-    lc, rc, jl, jr = _fg()
-    o = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {F} {F}" width="{F}" height="{F}">']
-    if bg:
-        o.append(f'  <rect width="{F}" height="{F}" fill="{bg}"/>')
-    o.append(f'  <g stroke="{color}" fill="none" stroke-linecap="round" stroke-linejoin="round">')
-    o.append(f'    <path d="{_d(*lc)}" stroke-width="{F_LS}"/>')
-    o.append(f'    <path d="{_d(*rc)}" stroke-width="{F_LS}"/>')
-    o.append(f'    <path d="{_da(jl[0], F_CB_Y, jr[0], F_CB_A)}" stroke-width="{F_CS}"/>')
-    o.append(f'  </g>')
-    o.append(f'  <circle cx="{F_APEX[0]}" cy="{F_APEX[1]}" r="{F_AR}" fill="{NC[0]}"/>')
-    o.append(f'  <circle cx="{jl[0]:.1f}" cy="{jl[1]:.1f}" r="{F_NR}" fill="{NC[1]}"/>')
-    o.append(f'  <circle cx="{jr[0]:.1f}" cy="{jr[1]:.1f}" r="{F_NR}" fill="{NC[2]}"/>')
-    o.append('</svg>')
-    return "\n".join(o)
+def full_svg(color="currentColor", bg=None, minify=False, precision=1):
+    return _svg_str(emit_svg, "full", color, bg, minify, precision)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -116,25 +178,118 @@ I_AR = 6.5
 I_NR = 5.5
 
 def _ig():
-    lc = _ctrl(I_LBX, I_BY, I_APEX, I_BOW, "left")
-    rc = _ctrl(I_RBX, I_BY, I_APEX, I_BOW, "right")
-    return lc, rc, _bez(_t_at_y(I_CB_Y, *lc), *lc), _bez(_t_at_y(I_CB_Y, *rc), *rc)
+    return _geometry(I_APEX, I_LBX, I_RBX, I_BY, I_BOW, I_CB_Y, I_CB_A)
+
+def icon_svg(color="currentColor", bg=None, minify=False, precision=1):
+    return _svg_str(emit_svg, "icon", color, bg, minify, precision)
+
+
+# ══════════════════════════════════════════════════════════════════
+#  SVG EMITTER  — standalone documents and a <symbol>/<use> sprite
+# ══════════════════════════════════════════════════════════════════
+
+SVG_THEMES = {   # name -> (kind, stroke color or None for currentColor, bg)
+    "nexus-a":            ("full", None, None),
+    "nexus-a-dark":       ("full", "#1a1a1a", "#ffffff"),
+    "nexus-a-light":      ("full", "#e8e8e8", "#1a1a1a"),
+    "nexus-a-brand":      ("full", "#3b82f6", "#0f172a"),
+    "nexus-a-icon":       ("icon", None, None),
+    "nexus-a-icon-dark":  ("icon", "#1a1a1a", "#ffffff"),
+    "nexus-a-icon-light": ("icon", "#e8e8e8", "#1a1a1a"),
+}
+SPRITE_VARS = ("--nexus-a-stroke", "--nexus-a-apex", "--nexus-a-left", "--nexus-a-right")
+
+def _svg_spec(kind):
+    """Geometry, viewBox size and stroke/node sizes of kind."""
+    if kind == "full":
+        return _fg(), F, (F_LS, F_CS, F_AR, F_NR)
+    return _ig(), IV, (I_LS, I_CS, I_AR, I_NR)
+
+@functools.lru_cache(maxsize=None)
+def _paths(g, prec=1, minify=False):
+    return (_d(*g.lc, prec=prec, minify=minify), _d(*g.rc, prec=prec, minify=minify),
+            _da(g.jl[0], g.cb_y, g.jr[0], g.cb_a, prec, minify))
+
+def _mark(kind, stroke, fills, depth, minify, prec):
+    """Yield the stroke group and node circles of kind, one tag per item.
+
+    stroke and fills are ready-made attributes, so standalone documents
+    can use plain colors and the sprite CSS variables.
+    """
+    g, _, (ls, cs, ar, nr) = _svg_spec(kind)
+    p = "" if minify else "  " * depth
+    q = "" if minify else "  " * (depth + 1)
+    n = lambda v: str(v) if isinstance(v, int) else _f(v, prec, minify)
+    yield f'{p}<g {stroke} fill="none" stroke-linecap="round" stroke-linejoin="round">'
+    for d, w in zip(_paths(g, prec, minify), (ls, ls, cs)):
+        yield f'{q}<path d="{d}" stroke-width="{n(w)}"/>'
+    yield f'{p}</g>'
+    for (cx, cy), r, fill in zip((g.apex, g.jl, g.jr), (ar, nr, nr), fills):
+        yield f'{p}<circle cx="{n(cx)}" cy="{n(cy)}" r="{n(r)}" {fill}/>'
 
-def icon_svg(color="currentColor", bg=None):
-    lc, rc, jl, jr = _ig()
-    o = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {IV} {IV}" width="{IV}" height="{IV}">']
+def _stream(out, tags, minify):
+    sep = "" if minify else "\n"
+    for i, tag in enumerate(tags):
+        out.write(tag if i == 0 else sep + tag)
+
+def emit_svg(out, kind="full", color="currentColor", bg=None, minify=False, precision=1):
+    """Stream a standalone SVG of kind to out (anything with .write()).
+
+    For a socket, pass sock.makefile("w").
+    """
+    if precision < 0:
+        raise ValueError(f"precision must be >= 0, got {precision}")
+    _stream(out, _svg_tags(kind, color, bg, minify, precision), minify)
+
+def _svg_tags(kind, color, bg, minify, prec):
+    _, view, _ = _svg_spec(kind)
+    p = "" if minify else "  "
+    yield (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {view} {view}" '
+           f'width="{view}" height="{view}">')
     if bg:
-        o.append(f'  <rect width="{IV}" height="{IV}" fill="{bg}"/>')
-    o.append(f'  <g stroke="{color}" fill="none" stroke-linecap="round" stroke-linejoin="round">')
-    o.append(f'    <path d="{_d(*lc)}" stroke-width="{I_LS}"/>')
-    o.append(f'    <path d="{_d(*rc)}" stroke-width="{I_LS}"/>')
-    o.append(f'    <path d="{_da(jl[0], I_CB_Y, jr[0], I_CB_A)}" stroke-width="{I_CS}"/>')
-    o.append(f'  </g>')
-    o.append(f'  <circle cx="{I_APEX[0]}" cy="{I_APEX[1]}" r="{I_AR}" fill="{NC[0]}"/>')
-    o.append(f'  <circle cx="{jl[0]:.1f}" cy="{jl[1]:.1f}" r="{I_NR}" fill="{NC[1]}"/>')
-    o.append(f'  <circle cx="{jr[0]:.1f}" cy="{jr[1]:.1f}" r="{I_NR}" fill="{NC[2]}"/>')
-    o.append('</svg>')
-    return "\n".join(o)
+        yield f'{p}<rect width="{view}" height="{view}" fill="{bg}"/>'
+    yield from _mark(kind, f'stroke="{color or "currentColor"}"',
+                     [f'fill="{c}"' for c in NC], 1, minify, prec)
+    yield '</svg>'
+
+def emit_sprite(out, themes=None, minify=False, precision=1):
+    """Stream one SVG sprite covering every theme to out.
+
+    Each kind's geometry is written once as <symbol id="nexus-a-<kind>-mark">
+    whose stroke and node fills read SPRITE_VARS (falling back to
+    currentColor and NC). Each theme is a <symbol id="<name>"> holding its
+    background rect and a <use> of the mark that only sets those
+    variables; reference it as <use href="sprite.svg#nexus-a-dark"/>.
+    """
+    if precision < 0:
+        raise ValueError(f"precision must be >= 0, got {precision}")
+    _stream(out, _sprite_tags(themes or SVG_THEMES, minify, precision), minify)
+
+def _sprite_tags(themes, minify, prec):
+    p = "" if minify else "  "
+    pp = p * 2
+    yield '<svg xmlns="http://www.w3.org/2000/svg">'
+    for kind in dict.fromkeys(k for k, _, _ in themes.values()):
+        _, view, _ = _svg_spec(kind)
+        yield f'{p}<symbol id="nexus-a-{kind}-mark" viewBox="0 0 {view} {view}">'
+        yield from _mark(kind, f'style="stroke:var({SPRITE_VARS[0]},currentColor)"',
+                         [f'style="fill:var({v},{c})"' for v, c in zip(SPRITE_VARS[1:], NC)],
+                         2, minify, prec)
+        yield f'{p}</symbol>'
+    for name, (kind, color, bg) in themes.items():
+        _, view, _ = _svg_spec(kind)
+        yield f'{p}<symbol id="{name}" viewBox="0 0 {view} {view}">'
+        if bg:
+            yield f'{pp}<rect width="{view}" height="{view}" fill="{bg}"/>'
+        style = f' style="{SPRITE_VARS[0]}:{color}"' if color else ""
+        yield f'{pp}<use href="#nexus-a-{kind}-mark"{style}/>'
+        yield f'{p}</symbol>'
+    yield '</svg>'
+
+def _svg_str(emit, *args):
+    buf = io.StringIO()
+    emit(buf, *args)
+    return buf.getvalue()
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -142,135 +297,881 @@ def icon_svg(color="currentColor", bg=None):
 # ══════════════════════════════════════════════════════════════════
 
 DIR = os.path.dirname(os.path.abspath(__file__))
+RENDERER = "sdf"   # "sdf" (analytic coverage) or "ovr" (oversample + LANCZOS)
 
-def main():
-    svgs = {
-        "nexus-a":            (full_svg, {}),
-        "nexus-a-dark":       (full_svg, {"color": "#1a1a1a", "bg": "#ffffff"}),
-        "nexus-a-light":      (full_svg, {"color": "#e8e8e8", "bg": "#1a1a1a"}),
-        "nexus-a-brand":      (full_svg, {"color": "#3b82f6", "bg": "#0f172a"}),
-        "nexus-a-icon":       (icon_svg, {}),
-        "nexus-a-icon-dark":  (icon_svg, {"color": "#1a1a1a", "bg": "#ffffff"}),
-        "nexus-a-icon-light": (icon_svg, {"color": "#e8e8e8", "bg": "#1a1a1a"}),
-    }
-    for name, (fn, kw) in svgs.items():
-        with open(os.path.join(DIR, f"{name}.svg"), "w", encoding="utf-8") as f:
-            f.write(fn(**kw))
-        print(f"  [OK] {name}.svg")
+def main(out=DIR, workers=None, renderer=RENDERER, pyramid=True, incremental=False,
+         minify=False, precision=1):
+    manifest = _load_manifest(out)
+    fresh = 0
+    svgs = {f"{name}.svg": (emit_svg, (kind, color, bg), (kind,))
+            for name, (kind, color, bg) in SVG_THEMES.items()}
+    svgs["nexus-a-sprite.svg"] = (emit_sprite, (SVG_THEMES,), ("full", "icon"))
+    for fname, (emit, args, kinds) in svgs.items():
+        fp = _digest("svg", emit.__name__, args, minify, precision,
+                     [_kind_params(k) for k in kinds])
+        if incremental and _current(out, manifest, fname, fp):
+            fresh += 1
+            continue
+        with _atomic(os.path.join(out, fname)) as tmp:
+            with open(tmp, "w", encoding="utf-8") as f:
+                emit(f, *args, minify, precision)
+        manifest[fname] = fp
+        print(f"  [OK] {fname}")
     try:
-        _pngs()
+        fresh += _pngs(out, workers, renderer, pyramid, manifest if incremental else None,
+                       manifest)
     except Exception as e:
         print(f"  [WARN] PNG: {e}")
+    finally:
+        _save_manifest(out, manifest)
+    if fresh:
+        print(f"  [--] {fresh} up to date")
     print("\nDone.")
 
 
 # ══════════════════════════════════════════════════════════════════
-#  PNG  — 2-4× oversampled for smooth, crack-free strokes
+#  PNG  — analytic coverage, or 2-4× oversampled for the legacy path
 # ══════════════════════════════════════════════════════════════════
 
-STEPS = 300   # polyline density for smooth curves
+STEPS = 300   # upper bound on polyline segments per curve
+TOL   = 0.2   # max deviation (render px) of a polyline from its curve
+
+def _segments(ctrl, sc):
+    """Wang's bound: segments keeping a Bezier within TOL px at scale sc."""
+    deg = len(ctrl) - 1
+    m = max(math.hypot(a[0] - 2*b[0] + c[0], a[1] - 2*b[1] + c[1])
+            for a, b, c in zip(ctrl, ctrl[1:], ctrl[2:])) * sc
+    return max(1, min(STEPS, math.ceil(math.sqrt(deg*(deg-1)/8 * m / TOL))))
+
+def _flatten(ctrl, ox, oy, sc):
+    """Evaluate a Bezier of any degree at all parameter values in one pass.
+
+    Returns a flat [x0, y0, x1, y1, ...] list, which ImageDraw accepts
+    directly.
+    """
+    import numpy as np
+    with _stage("flatten"):
+        deg = len(ctrl) - 1
+        t = np.linspace(0.0, 1.0, _segments(ctrl, sc) + 1)[:, None]
+        u = 1 - t
+        basis = np.hstack([math.comb(deg, k) * u**(deg-k) * t**k
+                           for k in range(deg+1)])
+        pts = basis @ np.asarray(ctrl, dtype=float) * sc + (ox, oy)
+        return pts.ravel().tolist()
 
 def _polyline(crv, ox, oy, sc):
-    return [(ox + _bez(i/STEPS, *crv)[0]*sc,
-             oy + _bez(i/STEPS, *crv)[1]*sc) for i in range(STEPS+1)]
+    return _flatten(crv, ox, oy, sc)
 
 def _arcline(jl, jr, cb_y, cb_a, ox, oy, sc):
-    pts = []
-    for i in range(STEPS+1):
-        f = i / STEPS
-        x = jl[0] + (jr[0] - jl[0]) * f
-        y = cb_y - cb_a * 4 * f * (1 - f)
-        pts.append((ox + x*sc, oy + y*sc))
-    return pts
-
-def _pngs():
+    # y = cb_y - 4·cb_a·f(1-f) is the quadratic with its control at 2·cb_a
+    return _flatten(((jl[0], cb_y),
+                     ((jl[0] + jr[0]) / 2, cb_y - 2*cb_a),
+                     (jr[0], cb_y)), ox, oy, sc)
+
+TILE = 500
+VARIANTS = [            # preview-sheet themes: (stroke color, background)
+    ("#1a1a1a", None),
+    ("#1a1a1a", "#ffffff"),
+    ("#e8e8e8", "#1a1a1a"),
+    ("#3b82f6", "#0f172a"),
+]
+SIZES = [16, 24, 32, 48, 64, 128, 256]
+ICON_COLOR = "#1a1a1a"
+
+# ── Pyramid + container outputs ──────────────────────────────────
+HINTED = 32   # sizes at or below get their own boosted render, not a downsample
+BUNDLES = {   # multi-resolution containers, written from in-memory icons
+    "nexus-a.ico":  [16, 24, 32, 48, 64, 128, 256],
+    "nexus-a.icns": [16, 32, 64, 128, 256, 512, 1024],
+    "favicon.ico":  [16, 32, 48],
+}
+FAVICONS = {  # name -> (size, bg)
+    "favicon-16x16.png":          (16, None),
+    "favicon-32x32.png":          (32, None),
+    "apple-touch-icon.png":       (180, "#ffffff"),
+    "android-chrome-192x192.png": (192, None),
+    "android-chrome-512x512.png": (512, None),
+}
+
+def _box(w, h, x0, y0, x1, y1):
+    """Clip a float bbox to the w×h grid; pixel-center coords inside it."""
+    import numpy as np
+    x0, y0 = max(0, math.floor(x0)), max(0, math.floor(y0))
+    x1, y1 = min(w, math.ceil(x1)), min(h, math.ceil(y1))
+    return x0, y0, np.arange(x0, x1, dtype=np.float32) + 0.5, \
+        np.arange(y0, y1, dtype=np.float32)[:, None] + 0.5
+
+def _coverage(x0, y0, sd):
+    """Signed distance (px, negative inside) -> 1px-wide AA coverage mask."""
+    import numpy as np
+    from PIL import Image
+    cov = np.clip(0.5 - sd, 0.0, 1.0)
+    return x0, y0, Image.fromarray((cov * 255 + 0.5).astype(np.uint8), "L")
+
+def _sdf_strokes(w, h, strokes):
+    """Coverage of a union of round-capped, round-joined polylines.
+
+    strokes is [(flat points, width), ...] in pixels. Each segment only
+    touches the pixels of its own padded bbox, so the cost follows the
+    stroke area, not the canvas.
+    """
+    import numpy as np
+    with _stage("raster") as st:
+        pad = max(wd for _, wd in strokes) / 2 + 1
+        xs_all = [v for pts, _ in strokes for v in pts[0::2]]
+        ys_all = [v for pts, _ in strokes for v in pts[1::2]]
+        x0, y0, gx, gy = _box(w, h, min(xs_all) - pad, min(ys_all) - pad,
+                              max(xs_all) + pad, max(ys_all) + pad)
+        sd = np.full((len(gy), len(gx)), np.inf, dtype=np.float32)
+        st["pixels"] = sd.size
+        for pts, wd in strokes:
+            hw = wd / 2
+            p = np.asarray(pts, dtype=np.float32).reshape(-1, 2)
+            for (ax, ay), (bx, by) in zip(p[:-1], p[1:]):
+                sx, sy, px, py = _box(w, h, min(ax, bx) - hw - 1, min(ay, by) - hw - 1,
+                                      max(ax, bx) + hw + 1, max(ay, by) + hw + 1)
+                px, py = px - ax, py - ay
+                dx, dy = bx - ax, by - ay
+                l2 = dx*dx + dy*dy
+                t = np.clip((px*dx + py*dy) / l2, 0.0, 1.0) if l2 else 0.0
+                d = np.hypot(px - t*dx, py - t*dy) - hw
+                sub = sd[sy-y0:sy-y0+d.shape[0], sx-x0:sx-x0+d.shape[1]]
+                np.minimum(sub, d, out=sub)
+        x0, y0, m = _coverage(x0, y0, sd)
+        st["image"] = _imbytes(m)
+        return x0, y0, m
+
+def _sdf_disc(w, h, c, r):
+    import numpy as np
+    with _stage("raster") as st:
+        x0, y0, gx, gy = _box(w, h, c[0] - r - 1, c[1] - r - 1, c[0] + r + 1, c[1] + r + 1)
+        st["pixels"] = gx.size * gy.size
+        x0, y0, m = _coverage(x0, y0, np.hypot(gx - c[0], gy - c[1]) - r)
+        st["image"] = _imbytes(m)
+        return x0, y0, m
+
+def _spec(kind, size):
+    """Geometry, scale and (hinted) stroke/node sizes of kind at size px."""
+    if kind == "full":
+        return _fg(), size / F, (F_LS, F_CS, F_AR, F_NR)
+    boost = 1.5 if size <= 20 else (1.2 if size <= 32 else 1.0)
+    return _ig(), size / IV, tuple(v * boost for v in (I_LS, I_CS, I_AR, I_NR))
+
+@functools.lru_cache(maxsize=32)
+def _masks(kind, size, renderer=RENDERER):
+    """Coverage masks (strokes, apex, left, right node) of kind at size px.
+
+    Each mask is (x0, y0, L image); the stroke mask spans the canvas, node
+    masks only their bbox. Colors play no part here, so one set of masks
+    serves every theme.
+    """
+    return _build_masks(kind, size, renderer)
+
+def _build_masks(kind, size, renderer=RENDERER, nodes=True):
+    """Uncached _masks; nodes=False builds only the stroke mask."""
+    from PIL import Image
+    g, sc, (ls, cs, ar, nr) = _spec(kind, size)
+    strokes = [(g.lc, ls), (g.rc, ls), (None, cs)]
+    nodes = [(g.apex, ar), (g.jl, nr), (g.jr, nr)] if nodes else []
+    if renderer == "ovr":
+        return _masks_ovr(g, size, sc, strokes, nodes)
+    strokes = [(_arcline(g.jl, g.jr, g.cb_y, g.cb_a, 0, 0, sc) if crv is None
+                else _polyline(crv, 0, 0, sc), wd*sc) for crv, wd in strokes]
+    x0, y0, m = _sdf_strokes(size, size, strokes)
+    with _stage("raster") as st:
+        full = Image.new("L", (size, size), 0)
+        full.paste(m, (x0, y0))
+        st["image"] = _imbytes(full)
+    return ((0, 0, full),
+            *(_sdf_disc(size, size, (nx*sc, ny*sc), r*sc) for (nx, ny), r in nodes))
+
+def _masks_ovr(g, size, sc, strokes, nodes):
+    """Legacy masks: draw each layer 2-4× oversampled, then LANCZOS down."""
     from PIL import Image, ImageDraw
+    ovr = 4 if size <= 32 else 2
+    rsz = size * ovr
+    s = sc * ovr
 
-    # ── Full-logo preview (4 variants, 2× oversample) ────────────
-    TILE = 500
-    OVR = 2
-    RT = TILE * OVR
-    variants = [
-        ("#1a1a1a", None),
-        ("#1a1a1a", "#ffffff"),
-        ("#e8e8e8", "#1a1a1a"),
-        ("#3b82f6", "#0f172a"),
-    ]
-    lc, rc, jl, jr = _fg()
-    sc = RT / F
-
-    big = Image.new("RGBA", (RT * len(variants), RT), (255,255,255,255))
-    d = ImageDraw.Draw(big)
-
-    for idx, (col, bg) in enumerate(variants):
-        ox = idx * RT
-        if bg:
-            d.rectangle([ox, 0, ox+RT-1, RT-1], fill=bg)
-
-        for crv in (lc, rc):
-            d.line(_polyline(crv, ox, 0, sc), fill=col,
-                   width=max(2, round(F_LS*sc)), joint="curve")
-        d.line(_arcline(jl, jr, F_CB_Y, F_CB_A, ox, 0, sc), fill=col,
-               width=max(2, round(F_CS*sc)), joint="curve")
-
-        nodes = [(F_APEX, F_AR, NC[0]), (jl, F_NR, NC[1]), (jr, F_NR, NC[2])]
-        for (nx, ny), r, nc in nodes:
-            pr = round(r * sc)
-            cx, cy = ox + nx*sc, ny*sc
-            d.ellipse([cx-pr, cy-pr, cx+pr, cy+pr], fill=nc)
-
-    preview = big.resize((TILE * len(variants), TILE), Image.LANCZOS)
-    preview.save(os.path.join(DIR, "preview-sheet.png"), "PNG")
-    print("  [OK] preview-sheet.png")
-
-    # ── Multi-size icon PNGs (4× oversample for small) ────────────
-    SIZES = [16, 24, 32, 48, 64, 128, 256]
-    ilc, irc, ijl, ijr = _ig()
-    icons = {}
-
-    for sz in SIZES:
-        ovr = 4 if sz <= 32 else 2
-        rsz = sz * ovr
-        s = rsz / IV
-        boost = 1.5 if sz <= 20 else (1.2 if sz <= 32 else 1.0)
-
-        im = Image.new("RGBA", (rsz, rsz), (0,0,0,0))
-        dd = ImageDraw.Draw(im)
-
-        for crv in (ilc, irc):
-            dd.line(_polyline(crv, 0, 0, s), fill="#1a1a1a",
-                    width=max(1, round(I_LS*s*boost)), joint="curve")
-        dd.line(_arcline(ijl, ijr, I_CB_Y, I_CB_A, 0, 0, s), fill="#1a1a1a",
-                width=max(1, round(I_CS*s*boost)), joint="curve")
-
-        nodes = [(I_APEX, I_AR, NC[0]), (ijl, I_NR, NC[1]), (ijr, I_NR, NC[2])]
-        for (nx, ny), r, nc in nodes:
-            pr = max(1, round(r*s*boost))
+    lines = [((_arcline(g.jl, g.jr, g.cb_y, g.cb_a, 0, 0, s) if crv is None
+               else _polyline(crv, 0, 0, s)), max(1, round(wd*s))) for crv, wd in strokes]
+
+    with _stage("raster") as st:
+        im = Image.new("L", (rsz, rsz), 0)
+        d = ImageDraw.Draw(im)
+        for pts, wd in lines:
+            d.line(pts, fill=255, width=wd, joint="curve")
+        layers = [im]
+
+        for (nx, ny), r in nodes:
+            im = Image.new("L", (rsz, rsz), 0)
+            pr = max(1, round(r*s))
             cx, cy = nx*s, ny*s
-            dd.ellipse([cx-pr, cy-pr, cx+pr, cy+pr], fill=nc)
-
-        im = im.resize((sz, sz), Image.LANCZOS)
-        im.save(os.path.join(DIR, f"icon-{sz}.png"), "PNG")
-        icons[sz] = im
-        print(f"  [OK] icon-{sz}.png")
-
-    # ── Size comparison sheet ─────────────────────────────────────
-    DISP = 128; PAD = 12
-    cols = len(SIZES)
-    sheet = Image.new("RGBA", (cols*(DISP+PAD)+PAD, DISP+PAD*2+20), (255,255,255,255))
-    sd = ImageDraw.Draw(sheet)
-    for i, sz in enumerate(SIZES):
-        x = PAD + i*(DISP+PAD)
-        up = icons[sz].resize((DISP, DISP), Image.NEAREST)
-        sheet.paste(up, (x, PAD), up)
-        lbl = f"{sz}px"
-        try: bb = sd.textbbox((0,0), lbl); tw = bb[2]-bb[0]
-        except: tw = len(lbl)*7
-        sd.text((x+(DISP-tw)//2, PAD+DISP+4), lbl, fill="#888888")
-    sheet.save(os.path.join(DIR, "icon-sizes-preview.png"), "PNG")
-    print("  [OK] icon-sizes-preview.png")
+            ImageDraw.Draw(im).ellipse([cx-pr, cy-pr, cx+pr, cy+pr], fill=255)
+            layers.append(im)
+        st["pixels"] = rsz * rsz * len(layers)
+        st["image"] = _imbytes(*layers)
+
+    with _stage("resample") as st:
+        st["pixels"] = (rsz * rsz + size * size) * len(layers)
+        out = tuple((0, 0, m.resize((size, size), Image.LANCZOS)) for m in layers)
+        st["image"] = _imbytes(*(m for _, _, m in out))
+        return out
+
+def _theme(size, col, bg, masks):
+    """Color one set of masks: strokes in col over bg, nodes in NC.
+
+    The stroke mask is recolored through a 256-entry RGBA palette (a
+    bg→col lerp, or col with the mask as alpha when there is no bg), so a
+    theme costs one palette lookup plus the small node composites.
+    """
+    from PIL import Image, ImageColor
+    with _stage("compose", size * size) as st:
+        c = ImageColor.getrgb(col)[:3]
+        if bg:
+            b = ImageColor.getrgb(bg)[:3]
+            pal = [x for v in range(256)
+                   for x in (*(round(bi + (ci - bi) * v / 255) for ci, bi in zip(c, b)), 255)]
+        else:
+            pal = [x for v in range(256) for x in (*c, v)]
+        pm = masks[0][2].copy()
+        pm.putpalette(pal, "RGBA")
+        im = pm.convert("RGBA")
+        st["image"] = _imbytes(pm, im)
+        for color, (x0, y0, n) in zip(NC, masks[1:]):
+            if 0 in n.size:
+                continue
+            layer = Image.new("RGBA", n.size, color)
+            layer.putalpha(n)
+            im.alpha_composite(layer, (x0, y0))
+            st["image"] += _imbytes(layer)
+        return im
+
+def render_themes(kind, size, themes, renderer=RENDERER):
+    """Render kind ("full" or "icon") at size px once per (color, bg) theme.
+
+    Rasterization happens once; each theme is only a composite of the
+    cached masks.
+    """
+    masks = _masks(kind, size, renderer)
+    return [_theme(size, col, bg, masks) for col, bg in themes]
+
+def _downsample_masks(size, masks):
+    """Area-average masks down to size px (exact reduce when integral).
+
+    Node masks are padded to the source canvas only for the resample and
+    cropped back to their bbox after, so _theme keeps compositing small
+    node patches at every level.
+    """
+    from PIL import Image
+    src = masks[0][2].width
+    f, r = divmod(src, size)
+    with _stage("resample") as st:
+        st["pixels"] = (src * src + size * size) * len(masks)
+        out = []
+        for i, (x0, y0, m) in enumerate(masks):
+            if m.size != (src, src):
+                full = Image.new("L", (src, src), 0)
+                full.paste(m, (x0, y0))
+                m = full
+            m = m.reduce(f) if r == 0 else m.resize((size, size), Image.BOX)
+            if i:
+                box = m.getbbox() or (0, 0, 0, 0)
+                out.append((box[0], box[1], m.crop(box)))
+            else:
+                out.append((0, 0, m))
+        st["image"] = _imbytes(*(m for _, _, m in out))
+        return tuple(out)
+
+def _pyramid_plan(sizes, pyramid=True):
+    """size -> source size (None: render directly) for one kind's levels.
+
+    Sizes above HINTED come from the smallest level at least twice as
+    large, chaining down from a single render of the largest size.
+    """
+    plan = {}
+    for sz in sorted(sizes, reverse=True):
+        bigger = [l for l in plan if l >= 2*sz] or [l for l in plan if l > sz]
+        plan[sz] = min(bigger) if pyramid and sz > HINTED and bigger else None
+    return plan
+
+def _preview_sheet(*tiles):
+    from PIL import Image
+    with _stage("compose", TILE * TILE * len(tiles)) as st:
+        sheet = Image.new("RGBA", (TILE * len(tiles), TILE), (255,255,255,255))
+        st["image"] = _imbytes(sheet)
+        for i, t in enumerate(tiles):
+            sheet.paste(t, (i * TILE, 0))
+        return sheet
+
+def _size_sheet(*icons):
+    from PIL import Image, ImageDraw
+    with _stage("compose") as st:
+        DISP = 128; PAD = 12
+        cols = len(SIZES)
+        sheet = Image.new("RGBA", (cols*(DISP+PAD)+PAD, DISP+PAD*2+20), (255,255,255,255))
+        st["image"] = _imbytes(sheet)
+        sd = ImageDraw.Draw(sheet)
+        for i, (sz, icon) in enumerate(zip(SIZES, icons)):
+            x = PAD + i*(DISP+PAD)
+            up = icon.resize((DISP, DISP), Image.NEAREST)
+            sheet.paste(up, (x, PAD), up)
+            lbl = f"{sz}px"
+            try: bb = sd.textbbox((0,0), lbl); tw = bb[2]-bb[0]
+            except: tw = len(lbl)*7
+            sd.text((x+(DISP-tw)//2, PAD+DISP+4), lbl, fill="#888888")
+        return sheet
+
+
+# ══════════════════════════════════════════════════════════════════
+#  SCHEDULER  — rasters as independent jobs, composites after inputs
+# ══════════════════════════════════════════════════════════════════
+
+def _save(im, path):
+    ims = sorted(im, key=lambda i: -i.width) if isinstance(im, list) else [im]
+    with _stage("encode", sum(i.width * i.height for i in ims)), _atomic(path) as tmp:
+        if isinstance(im, list):    # multi-resolution container, largest first
+            ims[0].save(tmp, sizes=[i.size for i in ims], append_images=ims[1:])
+        else:
+            im.save(tmp)
+
+def _task(fn, path, args, name=None, profile=False):
+    """Run one job; returns (result, profile records or None)."""
+    with Profiler(name) if profile else contextlib.nullcontext() as prof:
+        im = fn(*args)
+        if path:
+            _save(im, path)
+    return im, prof and prof.records
+
+def _schedule(jobs, workers=None, on_done=None):
+    """Run a job graph and return {name: result}.
+
+    jobs maps name -> (fn, args, deps, path). A job is submitted as soon
+    as every job named in deps has finished; their results are appended
+    to its args. If path is set the result image is saved there by the
+    worker and on_done(name) is called. workers=1 runs everything
+    in-process. Under an active Profiler, every job's stage records are
+    collected into it.
+    """
+    profile = PROFILE
+    done, running, pending = {}, {}, dict(jobs)
+
+    def ready():
+        for name, (fn, args, deps, path) in list(pending.items()):
+            if all(d in done for d in deps):
+                del pending[name]
+                yield name, (fn, path, (*args, *(done[d] for d in deps)),
+                             name, profile is not None)
+
+    def finish(name, out):
+        done[name], records = out
+        if records:
+            profile.records += records
+        if jobs[name][3]:
+            print(f"  [OK] {os.path.basename(jobs[name][3])}")
+            if on_done:
+                on_done(name)
+
+    if workers == 1 or not jobs:
+        while pending:
+            for name, call in list(ready()):
+                finish(name, _task(*call))
+        return done
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    with ProcessPoolExecutor(workers) as ex:
+        while pending or running:
+            for name, call in ready():
+                running[ex.submit(_task, *call)] = name
+            fin, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in fin:
+                finish(running.pop(fut), fut.result())
+    return done
+
+def _png_jobs(out, renderer=RENDERER, pyramid=True):
+    jobs = {"masks-full": (_masks, ("full", TILE, renderer), (), None)}
+    for i, (col, bg) in enumerate(VARIANTS):
+        jobs[f"tile-{i}"] = (_theme, (TILE, col, bg or "#ffffff"),
+                             ["masks-full"], None)
+    jobs["preview-sheet"] = (_preview_sheet, (), [f"tile-{i}" for i in range(len(VARIANTS))],
+                             os.path.join(out, "preview-sheet.png"))
+    levels = set(SIZES).union(*BUNDLES.values(), (s for s, _ in FAVICONS.values()))
+    plan = _pyramid_plan(levels, pyramid)
+    for sz, src in plan.items():
+        if src is None:
+            jobs[f"masks-icon-{sz}"] = (_masks, ("icon", sz, renderer), (), None)
+        else:
+            jobs[f"masks-icon-{sz}"] = (_downsample_masks, (sz,), [f"masks-icon-{src}"], None)
+        jobs[f"icon-{sz}"] = (_theme, (sz, ICON_COLOR, None), [f"masks-icon-{sz}"],
+                              os.path.join(out, f"icon-{sz}.png") if sz in SIZES else None)
+    jobs["icon-sizes-preview"] = (_size_sheet, (), [f"icon-{sz}" for sz in SIZES],
+                                  os.path.join(out, "icon-sizes-preview.png"))
+    for name, sizes in BUNDLES.items():
+        jobs[name] = (_bundle, (), [f"icon-{sz}" for sz in sizes], os.path.join(out, name))
+    for name, (sz, bg) in FAVICONS.items():
+        if bg:
+            jobs[name] = (_theme, (sz, ICON_COLOR, bg), [f"masks-icon-{sz}"], os.path.join(out, name))
+        else:
+            jobs[name] = (_same, (), [f"icon-{sz}"], os.path.join(out, name))
+    return jobs
+
+def _bundle(*ims):
+    return list(ims)
+
+def _same(im):
+    return im
+
+def _pngs(out=DIR, workers=None, renderer=RENDERER, pyramid=True, skip=None, record=None):
+    """Render the PNG job graph; returns how many outputs were skipped.
+
+    Outputs whose fingerprint matches skip (a manifest) are left alone,
+    along with any job only they depend on. Fingerprints of written
+    outputs are stored in record.
+    """
+    jobs = _png_jobs(out, renderer, pyramid)
+    fps = _fingerprints(jobs)
+    outputs = [n for n, job in jobs.items() if job[3]]
+    stale = [n for n in outputs
+             if skip is None or not _current(out, skip, os.path.basename(jobs[n][3]), fps[n])]
+    if record is None:
+        record = {}
+    _schedule(_needed(jobs, stale), workers,
+              lambda n: record.__setitem__(os.path.basename(jobs[n][3]), fps[n]))
+    return len(outputs) - len(stale)
+
+
+# ══════════════════════════════════════════════════════════════════
+#  INCREMENTAL BUILD  — content-hash manifest, atomic writes
+# ══════════════════════════════════════════════════════════════════
+
+RENDERER_VERSION = 1   # bump when a code change alters rendered output
+MANIFEST = ".manifest.json"
+
+def _kind_params(kind):
+    """Every parameter that shapes outputs of kind."""
+    pre, view = ("F_", F) if kind == "full" else ("I_", IV)
+    p = {k: v for k, v in sorted(globals().items()) if k.startswith(pre)}
+    return {**p, "view": view, "NC": NC, "STEPS": STEPS, "TOL": TOL}
+
+def _digest(*parts):
+    return hashlib.blake2b(repr((RENDERER_VERSION, parts)).encode(),
+                           digest_size=12).hexdigest()
+
+def _fingerprints(jobs):
+    """name -> hash of the job's function, args, params and its inputs."""
+    fps = {}
+
+    def fp(name):
+        if name not in fps:
+            fn, args, deps, _ = jobs[name]
+            params = _kind_params(args[0]) if fn is _masks else None
+            fps[name] = _digest(fn.__name__, args, params, [fp(d) for d in deps])
+        return fps[name]
+
+    for name in jobs:
+        fp(name)
+    return fps
+
+def _needed(jobs, names):
+    """Subgraph of jobs reachable from names through deps."""
+    keep = set()
+
+    def visit(name):
+        if name not in keep:
+            keep.add(name)
+            for d in jobs[name][2]:
+                visit(d)
+
+    for name in names:
+        visit(name)
+    return {n: job for n, job in jobs.items() if n in keep}
+
+def _current(out, manifest, fname, fp):
+    return manifest.get(fname) == fp and os.path.exists(os.path.join(out, fname))
+
+def _load_manifest(out):
+    try:
+        with open(os.path.join(out, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_manifest(out, manifest):
+    with _atomic(os.path.join(out, MANIFEST)) as tmp:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+@contextlib.contextmanager
+def _atomic(path):
+    """Yield a temp path beside path; it replaces path only on success."""
+    d, base = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(dir=d or ".", prefix=f".{base}.",
+                               suffix=os.path.splitext(base)[1])
+    os.close(fd)
+    try:
+        yield tmp
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+# ══════════════════════════════════════════════════════════════════
+#  PROFILING  — per-stage wall time, pixels, image and traced memory
+# ══════════════════════════════════════════════════════════════════
+
+PROFILE = None   # active Profiler, if any
+
+class Profiler:
+    """Collects stage records while active (use as a context manager).
+
+    Each record holds the stage, the output it served, wall seconds,
+    pixels allocated, bytes of the PIL images the stage created and the
+    peak of traced (Python/NumPy) memory above the stage's starting
+    level. tracemalloc cannot see Pillow's C buffers, so image bytes are
+    the memory figure for PIL stages. Jobs run on the process pool send
+    their records back to the Profiler active in the parent.
+    """
+
+    def __init__(self, output=None):
+        self.output = output
+        self.records = []
+
+    def __enter__(self):
+        global PROFILE
+        self._prev, PROFILE = PROFILE, self
+        self._tracing = not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc):
+        global PROFILE
+        PROFILE = self._prev
+        if self._tracing:
+            tracemalloc.stop()
+
+    def summary(self, key="stage"):
+        """Totals per stage (or per output): calls, wall, pixels; max image, traced."""
+        out = {}
+        for r in self.records:
+            a = out.setdefault(r[key] or "(shared)",
+                               {"calls": 0, "wall": 0.0, "pixels": 0, "image": 0, "traced": 0})
+            a["calls"] += 1
+            a["wall"] += r["wall"]
+            a["pixels"] += r["pixels"]
+            a["image"] = max(a["image"], r["image"])
+            a["traced"] = max(a["traced"], r["traced"])
+        return out
+
+    def report(self):
+        lines = []
+        for key in ("stage", "output"):
+            lines.append(f"  {key:<28} {'calls':>5} {'wall ms':>9} {'Mpx':>8} "
+                         f"{'image MB':>9} {'traced MB':>10}")
+            for k, a in sorted(self.summary(key).items(), key=lambda kv: -kv[1]["wall"]):
+                lines.append(f"  {k:<28} {a['calls']:>5} {a['wall']*1e3:>9.2f} "
+                             f"{a['pixels']/1e6:>8.2f} {a['image']/2**20:>9.2f} "
+                             f"{a['traced']/2**20:>10.2f}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def to_json(self):
+        return {"stages": self.summary("stage"), "outputs": self.summary("output"),
+                "records": self.records}
+
+@contextlib.contextmanager
+def _stage(name, pixels=0):
+    """Time one stage under the active Profiler; yields its record.
+
+    Stages must not nest. Callers may fill in rec["pixels"] and
+    rec["image"] (see _imbytes) once known.
+    """
+    prof = PROFILE
+    if prof is None:
+        yield {}
+        return
+    rec = {"stage": name, "output": prof.output, "pixels": pixels, "image": 0}
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    t = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        rec["wall"] = time.perf_counter() - t
+        rec["traced"] = max(0, tracemalloc.get_traced_memory()[1] - base)
+        prof.records.append(rec)
+
+def _imbytes(*ims):
+    """Pixel-buffer bytes of PIL images (untracked by tracemalloc)."""
+    return sum(i.width * i.height * len(i.getbands()) for i in ims)
+
+
+# ══════════════════════════════════════════════════════════════════
+#  LIBRARY API  — in-memory renders, LRU cache, HTTP stand-in
+# ══════════════════════════════════════════════════════════════════
+
+KINDS   = {"full": full_svg, "icon": icon_svg}
+FORMATS = {"png": "image/png", "webp": "image/webp", "svg": "image/svg+xml"}
+MAX_SIZE = 4096
+
+def render(kind="icon", size=IV, color=None, bg=None, fmt="png", renderer=RENDERER):
+    """Render one asset to bytes without touching disk.
+
+    color defaults to currentColor for SVG and ICON_COLOR for rasters;
+    size only applies to raster formats.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"unknown kind {kind!r}")
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}")
+    _check_color(color)
+    _check_color(bg)
+    if fmt == "svg":
+        return KINDS[kind](color or "currentColor", bg).encode("utf-8")
+    if not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"size must be 1..{MAX_SIZE}")
+    masks = MASKS.get((kind, size, renderer), lambda: _build_masks(kind, size, renderer))
+    im = _theme(size, color or ICON_COLOR, bg, masks)
+    buf = io.BytesIO()
+    with _stage("encode", size * size):
+        im.save(buf, fmt.upper())
+    return buf.getvalue()
+
+def _check_color(v):
+    """Allow only #hex, currentColor and named colors; values reach SVG markup."""
+    if v is None or v == "currentColor":
+        return
+    if v.startswith("#") and len(v) in (4, 5, 7, 9) and \
+            all(ch in "0123456789abcdefABCDEF" for ch in v[1:]):
+        return
+    if v.isascii() and v.isalpha():
+        from PIL import ImageColor
+        if v.lower() in ImageColor.colormap:
+            return
+    raise ValueError(f"invalid color {v!r}")
+
+class AssetCache:
+    """LRU of rendered assets, bounded by total bytes rather than entries.
+
+    Entries are keyed by the render parameters and carry a content-hash
+    ETag, so callers can answer conditional requests without re-reading
+    the body.
+    """
+
+    def __init__(self, max_bytes=64 << 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, make):
+        """Return (etag, data) for key, calling make() on a miss."""
+        with self._lock:
+            hit = self._items.get(key)
+            if hit:
+                self._items.move_to_end(key)
+                return hit[0]
+        entry, n = self._entry(make())
+        with self._lock:
+            if key not in self._items and n <= self.max_bytes:
+                self._items[key] = (entry, n)
+                self.nbytes += n
+                while self.nbytes > self.max_bytes:
+                    _, (_, old) = self._items.popitem(last=False)
+                    self.nbytes -= old
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def _entry(self, data):
+        """(cached entry, its size in bytes) for freshly made data."""
+        return (hashlib.blake2b(data, digest_size=12).hexdigest(), data), len(data)
+
+class _MaskCache(AssetCache):
+    """AssetCache of _masks() results, charged by their image bytes.
+
+    render() keeps masks here rather than in _masks' entry-count LRU, so
+    each extra theme at a size is only a composite while memory stays
+    bounded for arbitrary request sizes.
+    """
+
+    def _entry(self, masks):
+        return masks, _imbytes(*(m for _, _, m in masks))
+
+CACHE = AssetCache()
+MASKS = _MaskCache()
+
+def cached_render(kind="icon", size=IV, color=None, bg=None, fmt="png", renderer=RENDERER):
+    """render() through CACHE; returns (etag, data)."""
+    key = (kind, size if fmt != "svg" else 0, color, bg, fmt, renderer)
+    return CACHE.get(key, lambda: render(kind, size, color, bg, fmt, renderer))
+
+def _color(v):
+    """Query colors may omit the '#': ?color=3b82f6."""
+    if v and len(v) in (3, 6, 8) and all(ch in "0123456789abcdefABCDEF" for ch in v):
+        return "#" + v
+    return v or None
+
+def serve(port=8000, host="127.0.0.1"):
+    """Serve GET /logo/<kind>?size=&color=&bg=&format= from CACHE."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlsplit
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = url.path.strip("/").split("/")
+            if len(parts) != 2 or parts[0] != "logo":
+                return self.send_error(404)
+            q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            fmt = q.get("format", "png")
+            try:
+                etag, data = cached_render(parts[1], int(q.get("size", IV)),
+                                           _color(q.get("color")), _color(q.get("bg")), fmt)
+            except ValueError as e:
+                return self.send_error(400, str(e))
+            tag = f'"{etag}"'
+            if tag in self.headers.get("If-None-Match", ""):
+                self.send_response(304)
+                self.send_header("ETag", tag)
+                return self.end_headers()
+            self.send_response(200)
+            self.send_header("Content-Type", FORMATS[fmt])
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("ETag", tag)
+            self.send_header("Cache-Control", "public, max-age=86400")
+            self.send_header("X-Content-Type-Options", "nosniff")
+            self.end_headers()
+            self.wfile.write(data)
+
+    srv = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving Nexus A on http://{host}:{port}/logo/icon?size=48")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+
+
+# ══════════════════════════════════════════════════════════════════
+#  ANIMATION  — static strokes once, per-frame node regions only
+# ══════════════════════════════════════════════════════════════════
+
+ANIM_MAX_PIXELS = 1 << 26   # every RGBA frame is held until encoding: ~256 MB
+
+def animate(kind="full", size=512, frames=60, fmt="png", color=ICON_COLOR, bg=None,
+            duration=33, amp=0.25, renderer=RENDERER):
+    """Pulse the three nodes in turn; returns APNG (fmt="png") or WebP bytes.
+
+    The strokes are rasterized once into a node-less base frame. Each
+    frame copies it and redraws only the bboxes of the nodes at their
+    current radius, so consecutive frames differ only there and the
+    APNG/WebP encoders store just the changed region per frame.
+    """
+    from PIL import Image
+    if fmt not in ("png", "webp"):
+        raise ValueError(f"unknown animation format {fmt!r}")
+    if frames < 1:
+        raise ValueError("frames must be at least 1")
+    if not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"size must be 1..{MAX_SIZE}")
+    if size * size * frames > ANIM_MAX_PIXELS:
+        raise ValueError(f"size*size*frames must be at most {ANIM_MAX_PIXELS}")
+    g, sc, (_, _, ar, nr) = _spec(kind, size)
+    base = _theme(size, color, bg, _build_masks(kind, size, renderer, nodes=False))
+
+    nodes = []
+    for (nx, ny), r, nc in zip((g.apex, g.jl, g.jr), (ar, nr, nr), NC):
+        cx, cy, r = nx*sc, ny*sc, r*sc
+        reach = r * (1 + amp) + 1
+        box = (max(0, math.floor(cx - reach)), max(0, math.floor(cy - reach)),
+               min(size, math.ceil(cx + reach)), min(size, math.ceil(cy + reach)))
+        nodes.append((box, (cx - box[0], cy - box[1]), r, nc, base.crop(box)))
+
+    out = []
+    for f in range(frames):
+        im = base.copy()
+        for i, (box, c, r, nc, under) in enumerate(nodes):
+            k = 1 + amp * math.sin(2*math.pi * (f/frames - i/3))
+            x0, y0, m = _sdf_disc(box[2] - box[0], box[3] - box[1], c, r*k)
+            patch = under.copy()
+            layer = Image.new("RGBA", m.size, nc)
+            layer.putalpha(m)
+            patch.alpha_composite(layer, (x0, y0))
+            im.paste(patch, box[:2])
+        out.append(im)
+
+    buf = io.BytesIO()
+    with _stage("encode", size * size * frames):
+        out[0].save(buf, fmt.upper(), save_all=True, append_images=out[1:],
+                    duration=duration, loop=0)
+    return buf.getvalue()
 
 
 if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Generate Nexus A logo assets.")
+    ap.add_argument("-o", "--out", default=DIR, help="output directory")
+    ap.add_argument("-j", "--workers", type=int, default=None,
+                    help="render processes (default: CPU count, 1 = in-process)")
+    ap.add_argument("--renderer", choices=("sdf", "ovr"), default=RENDERER,
+                    help="sdf: analytic coverage; ovr: legacy oversample + LANCZOS")
+    ap.add_argument("--no-pyramid", dest="pyramid", action="store_false",
+                    help="render every icon size directly instead of downsampling")
+    ap.add_argument("-i", "--incremental", action="store_true",
+                    help=f"only re-render outputs whose inputs changed (see {MANIFEST})")
+    ap.add_argument("--minify", action="store_true", help="write compact SVGs")
+    ap.add_argument("--precision", type=int, default=1, help="SVG decimal places")
+    ap.add_argument("--profile", action="store_true",
+                    help="report wall time, pixels, image and traced memory per stage and output")
+    ap.add_argument("--profile-json", metavar="PATH", help="write the profile as JSON")
+    ap.add_argument("--serve", type=int, metavar="PORT",
+                    help="serve assets over HTTP from memory instead of writing files")
+    ap.add_argument("--cache-mb", type=int, default=64,
+                    help="--serve cache size, for encoded assets and for masks each")
+    ap.add_argument("--animate", metavar="PATH",
+                    help="write a node-pulse animation (.png = APNG, .webp) instead")
+    ap.add_argument("--kind", choices=tuple(KINDS), default="full", help="--animate kind")
+    ap.add_argument("--size", type=int, default=512, help="--animate size in px")
+    ap.add_argument("--frames", type=int, default=60, help="--animate frame count")
+    a = ap.parse_args()
+    if a.workers is not None and a.workers < 1:
+        ap.error("-j/--workers must be at least 1")
+    if a.precision < 0:
+        ap.error("--precision must be at least 0")
+    if a.animate:
+        fmt = os.path.splitext(a.animate)[1].lstrip(".").lower()
+        if fmt not in ("png", "webp"):
+            ap.error("--animate PATH must end in .png or .webp")
+        if a.frames < 1:
+            ap.error("--frames must be at least 1")
+        if not 1 <= a.size <= MAX_SIZE:
+            ap.error(f"--size must be 1..{MAX_SIZE}")
+        if a.size * a.size * a.frames > ANIM_MAX_PIXELS:
+            ap.error(f"--size squared times --frames must be at most {ANIM_MAX_PIXELS}")
+        with _atomic(a.animate) as tmp:
+            with open(tmp, "wb") as f:
+                f.write(animate(a.kind, a.size, a.frames, fmt, renderer=a.renderer))
+        print(f"  [OK] {os.path.basename(a.animate)}")
+        raise SystemExit
+    if a.serve:
+        CACHE.max_bytes = MASKS.max_bytes = a.cache_mb << 20
+        serve(a.serve)
+        raise SystemExit
+    os.makedirs(a.out, exist_ok=True)
     print("Generating Nexus A v5 (colored nodes + smooth strokes)...\n")
-    main()
+    with (Profiler() if a.profile or a.profile_json else contextlib.nullcontext()) as prof:
+        main(a.out, a.workers, a.renderer, a.pyramid, a.incremental,
+             a.minify, a.precision)
+    if a.profile:
+        print("\n" + prof.report())
+    if a.profile_json:
+        with open(a.profile_json, "w", encoding="utf-8") as f:
+            json.dump(prof.to_json(), f, indent=2)